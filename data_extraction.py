@@ -2,64 +2,612 @@
 # use appropriate function
 # return extracted data
 
-import fitz  # PyMuPDF (install via pip install PyMuPDF)
-import docx  # python-docx (install via pip install python-docx)
-from pptx import Presentation  # python-pptx (pip install python-pptx)
+import asyncio
+import atexit
+import hashlib
+import io
+import mmap
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_from_pdf(pdf_path):
+# fitz (PyMuPDF), docx (python-docx) and pptx (python-pptx) are
+# imported inside the extractor that needs them, so e.g. a txt-only
+# caller never pays their import cost; sys.modules makes repeat
+# imports free
+
+# tesseract's OpenMP threading hurts more than it helps for our
+# one-image-per-worker dispatch; pin it before the engine loads
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# OCR backends are probed on first OCR call rather than at import —
+# google.cloud.vision alone drags in the whole gRPC/proto stack
+_OCR_BACKENDS_CHECKED = False
+TESSERACT_AVAILABLE = False
+TESSEROCR_AVAILABLE = False
+GOOGLE_VISION_AVAILABLE = False
+CV2_AVAILABLE = False
+
+def _ensure_ocr_backends():
+    global _OCR_BACKENDS_CHECKED, TESSERACT_AVAILABLE, TESSEROCR_AVAILABLE
+    global GOOGLE_VISION_AVAILABLE, CV2_AVAILABLE
+    global pytesseract, Image, ImageStat, PyTessBaseAPI, PSM, vision, cv2, np
+    if _OCR_BACKENDS_CHECKED:
+        return
+    _OCR_BACKENDS_CHECKED = True
+    try:
+        import pytesseract
+        from PIL import Image, ImageStat
+        TESSERACT_AVAILABLE = True
+    except ImportError:
+        pass
+    try:
+        import cv2
+        import numpy as np
+        CV2_AVAILABLE = True
+    except ImportError:
+        pass
+    try:
+        from tesserocr import PyTessBaseAPI, PSM
+        TESSEROCR_AVAILABLE = True
+    except ImportError:
+        pass
+    try:
+        from google.cloud import vision
+        GOOGLE_VISION_AVAILABLE = True
+    except ImportError:
+        pass
+
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+# one long-lived tesseract API handle per process; re-creating it per
+# image would re-load the language model every call
+_TESS_API = None
+
+def _get_tess_api():
+    global _TESS_API
+    if _TESS_API is None:
+        _TESS_API = PyTessBaseAPI(psm=PSM.AUTO)
+        atexit.register(_TESS_API.End)
+    return _TESS_API
+
+# embedded screenshots can be 4000px+ wide; OCR cost scales with pixel
+# count, and text stays readable well below this cap
+_OCR_MAX_DIM = 2000
+
+def _decode_for_ocr(image_bytes):
+    # decode once and share between the blank check and tesseract;
+    # cv2.imdecode goes straight from compressed bytes to a grayscale
+    # numpy array (libjpeg-turbo does the 3->1 channel drop for free),
+    # skipping PIL's intermediate RGB bitmap
+    if CV2_AVAILABLE:
+        mat = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8),
+                           cv2.IMREAD_GRAYSCALE)
+        if mat is not None:
+            return mat
+    if TESSERACT_AVAILABLE:
+        return Image.open(io.BytesIO(image_bytes))
+    return None
+
+def _preprocess_for_ocr(img):
+    # grayscale (3 channels -> 1) and downscale oversize images so
+    # tesseract pushes far fewer pixels through its LSTM
+    if CV2_AVAILABLE and isinstance(img, np.ndarray):
+        h, w = img.shape[:2]
+        if max(h, w) > _OCR_MAX_DIM:
+            scale = _OCR_MAX_DIM / max(h, w)
+            img = cv2.resize(img, (int(w * scale), int(h * scale)),
+                             interpolation=cv2.INTER_AREA)
+        return img
+    if img.mode != "L":
+        img = img.convert("L")
+    if max(img.size) > _OCR_MAX_DIM:
+        img.thumbnail((_OCR_MAX_DIM, _OCR_MAX_DIM), Image.LANCZOS)
+    return img
+
+# spacers, solid banners and signature lines have near-zero pixel
+# variance and no text; skipping them saves a full OCR call each
+_BLANK_STDDEV = 5.0
+_MIN_OCR_PIXELS = 400
+
+def _is_blank_image(img):
+    if CV2_AVAILABLE and isinstance(img, np.ndarray):
+        if img.shape[0] * img.shape[1] < _MIN_OCR_PIXELS:
+            return True
+        return float(img.std()) < _BLANK_STDDEV
+    if img.size[0] * img.size[1] < _MIN_OCR_PIXELS:
+        return True  # too small to hold readable text
+    gray = img if img.mode == "L" else img.convert("L")
+    return max(ImageStat.Stat(gray).stddev) < _BLANK_STDDEV
+
+def _extract_text_tesseract(image_bytes, img=None):
+    if img is None:
+        img = _decode_for_ocr(image_bytes)
+    img = _preprocess_for_ocr(img)
+    if CV2_AVAILABLE and isinstance(img, np.ndarray):
+        if TESSEROCR_AVAILABLE:
+            api = _get_tess_api()
+            mat = np.ascontiguousarray(img)
+            api.SetImageBytes(mat.tobytes(), mat.shape[1], mat.shape[0],
+                              1, mat.shape[1])
+            return api.GetUTF8Text()
+        # pytesseract accepts numpy arrays directly
+        return pytesseract.image_to_string(img, config="--oem 1 --psm 6")
+    if TESSEROCR_AVAILABLE:
+        api = _get_tess_api()
+        api.SetImage(img)
+        return api.GetUTF8Text()
+    # --oem 1 pins the fast LSTM model
+    return pytesseract.image_to_string(img, config="--oem 1 --psm 6")
+
+# Vision's documented ceiling for BatchAnnotateImages
+_VISION_BATCH_LIMIT = 16
+
+# one client per process: each constructor builds a gRPC channel and
+# loads credentials, and reusing the channel keeps the TCP+TLS
+# handshake and HTTP/2 connection warm across RPCs
+_VISION_CLIENT = None
+
+def _get_vision_client():
+    global _VISION_CLIENT
+    if _VISION_CLIENT is None:
+        _VISION_CLIENT = vision.ImageAnnotatorClient()
+    return _VISION_CLIENT
+
+def _extract_text_google_vision(image_bytes):
+    client = _get_vision_client()
+    response = client.text_detection(image=vision.Image(content=image_bytes))
+    if response.text_annotations:
+        return response.text_annotations[0].description
+    return ""
+
+def _extract_text_google_vision_batch(image_bytes_list):
+    # one BatchAnnotateImages RPC per 16 images amortizes the gRPC
+    # round trip that dominates per-image text_detection calls
+    client = _get_vision_client()
+    texts = []
+    for start in range(0, len(image_bytes_list), _VISION_BATCH_LIMIT):
+        chunk = image_bytes_list[start:start + _VISION_BATCH_LIMIT]
+        requests = [
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=b),
+                features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)])
+            for b in chunk
+        ]
+        response = client.batch_annotate_images(requests=requests)
+        texts.extend(
+            r.text_annotations[0].description if r.text_annotations else ""
+            for r in response.responses)
+    return texts
+
+# Vision is network-bound (hundreds of ms per round trip), so issue
+# the batch RPCs for a big document concurrently instead of one after
+# another; the semaphore caps in-flight requests
+_VISION_MAX_CONCURRENCY = 16
+_VISION_RETRIES = 3
+
+def _vision_requests(image_bytes_chunk):
+    return [
+        vision.AnnotateImageRequest(
+            image=vision.Image(content=b),
+            features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)])
+        for b in image_bytes_chunk
+    ]
+
+async def _gather_vision_ocr(image_bytes_list):
+    from google.cloud.vision_v1 import ImageAnnotatorAsyncClient
+    client = ImageAnnotatorAsyncClient()
+    sem = asyncio.Semaphore(_VISION_MAX_CONCURRENCY)
+
+    async def ocr_chunk(chunk):
+        async with sem:
+            for attempt in range(_VISION_RETRIES):
+                try:
+                    response = await client.batch_annotate_images(
+                        requests=_vision_requests(chunk))
+                    return [
+                        r.text_annotations[0].description if r.text_annotations else ""
+                        for r in response.responses
+                    ]
+                except Exception:
+                    if attempt == _VISION_RETRIES - 1:
+                        raise
+                    # exponential backoff, mainly for 429 rate limits
+                    await asyncio.sleep(2 ** attempt)
+
+    chunks = [image_bytes_list[i:i + _VISION_BATCH_LIMIT]
+              for i in range(0, len(image_bytes_list), _VISION_BATCH_LIMIT)]
+    results = await asyncio.gather(*[ocr_chunk(c) for c in chunks])
+    return [text for chunk_texts in results for text in chunk_texts]
+
+def _extract_text_google_vision_async(image_bytes_list):
+    # sync entry point for the concurrent dispatch above
+    return asyncio.run(_gather_vision_ocr(image_bytes_list))
+
+# tesseract can hang on very long list files, so stay well below that
+_TESS_BATCH_LIMIT = 40
+
+def _extract_text_tesseract_batch(image_bytes_list):
+    # one tesseract invocation per batch amortizes the engine init
+    # (~20% of per-image wall time) across all images in a document;
+    # images get the same blank skip, grayscale/downscale and engine
+    # config as the per-image path, so both produce identical results
+    # for identical bytes (they share a cache key)
+    if not image_bytes_list:
+        return []
+    texts = [None] * len(image_bytes_list)
+    with tempfile.TemporaryDirectory(prefix="ragger_ocr_") as tmpdir:
+        paths = []
+        path_indices = []
+        for idx, image_bytes in enumerate(image_bytes_list):
+            img = None
+            try:
+                img = _decode_for_ocr(image_bytes)
+                if img is not None and _is_blank_image(img):
+                    texts[idx] = ""
+                    continue
+            except Exception:
+                img = None
+            path = os.path.join(tmpdir, f"img{idx}.png")
+            saved = False
+            if img is not None:
+                try:
+                    img = _preprocess_for_ocr(img)
+                    if CV2_AVAILABLE and isinstance(img, np.ndarray):
+                        saved = bool(cv2.imwrite(path, img))
+                    else:
+                        img.save(path)
+                        saved = True
+                except Exception:
+                    saved = False
+            if not saved:
+                # undecodable here; hand tesseract the original bytes
+                path = os.path.join(tmpdir, f"img{idx}.img")
+                with open(path, "wb") as f:
+                    f.write(image_bytes)
+            paths.append(path)
+            path_indices.append(idx)
+        if not paths:
+            return texts
+        list_file = os.path.join(tmpdir, "list.txt")
+        with open(list_file, "w") as f:
+            f.write("\n".join(paths))
+        out = pytesseract.image_to_string(list_file, config="--oem 1 --psm 6")
+    # tesseract separates per-image output with a form feed
+    ocr_texts = out.split("\x0c")
+    if len(ocr_texts) == len(paths) + 1 and not ocr_texts[-1].strip():
+        ocr_texts = ocr_texts[:-1]
+    if len(ocr_texts) != len(paths):
+        raise ValueError("tesseract batch output did not match image count")
+    for idx, text in zip(path_indices, ocr_texts):
+        texts[idx] = text
+    return texts
+
+# logos/headers/footers repeat across pages and slides, so identical
+# bytes get OCR'd many times per document; a content-hash disk cache
+# turns each repeat into a ~1ms hash + read instead of a full OCR call
+_OCR_CACHE_DIR = os.environ.get(
+    "RAGGER_OCR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ragger", "ocr"))
+
+def _ocr_backend_name(use_google_vision=False):
+    _ensure_ocr_backends()
+    if use_google_vision and GOOGLE_VISION_AVAILABLE:
+        return "vision"
+    if TESSEROCR_AVAILABLE:
+        return "tesserocr"
+    if TESSERACT_AVAILABLE:
+        return "tesseract"
+    return "none"
+
+def _ocr_cache_key(image_bytes, backend):
+    return backend + "_" + hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+def _ocr_cache_get(key):
+    try:
+        with open(os.path.join(_OCR_CACHE_DIR, key + ".txt"), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _ocr_cache_put(key, text):
+    try:
+        os.makedirs(_OCR_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_OCR_CACHE_DIR)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # atomic rename so concurrent workers never see partial entries
+        os.replace(tmp_path, os.path.join(_OCR_CACHE_DIR, key + ".txt"))
+    except OSError:
+        pass
+
+def extract_text_from_image(image_bytes, use_google_vision=False):
+    # OCR a single image; returns "" when no backend is installed
+    text = _ocr_image_cached(image_bytes, use_google_vision)
+    return "" if text is None else text
+
+def _ocr_image_cached(image_bytes, use_google_vision=False):
+    # returns None when OCR failed or no backend exists — failures are
+    # never written to the cache, only real (possibly empty) results
+    backend = _ocr_backend_name(use_google_vision)
+    if backend == "none":
+        return None
+    key = _ocr_cache_key(image_bytes, backend)
+    cached = _ocr_cache_get(key)
+    if cached is not None:
+        return cached
+    # decode once: the blank check and tesseract reuse the same image
+    img = None
+    try:
+        img = _decode_for_ocr(image_bytes)
+        if img is not None and _is_blank_image(img):
+            _ocr_cache_put(key, "")
+            return ""
+    except Exception:
+        img = None
+    try:
+        if backend == "vision":
+            text = _extract_text_google_vision(image_bytes)
+        else:
+            text = _extract_text_tesseract(image_bytes, img=img)
+    except Exception:
+        return None
+    _ocr_cache_put(key, text)
+    return text
+
+def _init_ocr_worker():
+    # Tesseract's own OpenMP threading fights the process pool;
+    # one thread per worker process is faster overall
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _ensure_ocr_backends()
+    if TESSEROCR_AVAILABLE:
+        # pay the model load once per worker, not once per image
+        _get_tess_api()
+
+# a 300-image deck of 4 MB JPEGs would otherwise sit fully resident
+# while OCR runs; windowing keeps only this many images' bytes alive
+_OCR_WINDOW = 64
+
+def _ocr_image_jobs(image_jobs, use_google_vision=False):
+    # OCR (name, bytes) jobs window-by-window; returns (name, ocr_text)
+    results = []
+    for start in range(0, len(image_jobs), _OCR_WINDOW):
+        window = image_jobs[start:start + _OCR_WINDOW]
+        texts = _ocr_images([job[1] for job in window], use_google_vision)
+        results.extend((job[0], text) for job, text in zip(window, texts))
+    return results
+
+# per-worker document handle for the xref-based PDF path, opened once
+# in the pool initializer and reused for every image in that worker
+_WORKER_DOC = None
+
+def _init_pdf_worker(pdf_path):
+    import fitz
+    _init_ocr_worker()
+    global _WORKER_DOC
+    _WORKER_DOC = fitz.open(pdf_path)
+    atexit.register(_WORKER_DOC.close)
+
+def _pdf_ocr_worker(xref):
+    base_image = _WORKER_DOC.extract_image(xref)
+    return base_image["ext"], extract_text_from_image(base_image["image"])
+
+def _ocr_pdf_images(doc, pdf_path, image_refs, use_google_vision):
+    # returns (ext, ocr_text) per (page_num, img_index, xref) entry
+    if not image_refs:
+        return []
+    backend = _ocr_backend_name(use_google_vision)
+    if backend != "tesserocr" or len(image_refs) == 1:
+        # vision batching and the tesseract list file want the raw bytes
+        # in-process anyway; extract and OCR a window at a time so peak
+        # memory holds one window of decoded bytes, not the whole doc's
+        results = []
+        for start in range(0, len(image_refs), _OCR_WINDOW):
+            window = image_refs[start:start + _OCR_WINDOW]
+            base_images = [doc.extract_image(ref[2]) for ref in window]
+            texts = _ocr_images([b["image"] for b in base_images],
+                                use_google_vision)
+            results.extend((b["ext"], t) for b, t in zip(base_images, texts))
+            del base_images
+        return results
+    # tesserocr workers hold their own doc handle and API, so pickling
+    # (pdf_path, xref) instead of multi-MB image bytes avoids the IPC
+    # cost that otherwise eats the multiprocess win
+    max_workers = min(os.cpu_count() or 1, 4)
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_pdf_worker,
+                             initargs=(pdf_path,)) as ex:
+        return list(ex.map(_pdf_ocr_worker,
+                           [ref[2] for ref in image_refs], chunksize=2))
+
+def _ocr_images(image_bytes_list, use_google_vision=False):
+    # resolve duplicate/previously-seen images from the disk cache first,
+    # then OCR only the misses
+    if not image_bytes_list:
+        return []
+    backend = _ocr_backend_name(use_google_vision)
+    if backend == "none":
+        # no backend: nothing to OCR and nothing worth caching
+        return [""] * len(image_bytes_list)
+    texts = [None] * len(image_bytes_list)
+    keys = [_ocr_cache_key(b, backend) for b in image_bytes_list]
+    miss_indices = []
+    # identical bytes within one call (repeated logos in one window)
+    # are OCR'd once and fanned out, not once per occurrence
+    first_miss_for_key = {}
+    duplicate_of = {}
+    for idx, key in enumerate(keys):
+        cached = _ocr_cache_get(key)
+        if cached is not None:
+            texts[idx] = cached
+        elif key in first_miss_for_key:
+            duplicate_of[idx] = first_miss_for_key[key]
+        else:
+            first_miss_for_key[key] = idx
+            miss_indices.append(idx)
+    miss_texts = _ocr_images_uncached(
+        [image_bytes_list[i] for i in miss_indices], use_google_vision)
+    for idx, text in zip(miss_indices, miss_texts):
+        if text is None:
+            # OCR failed for this image; return empty text but leave the
+            # cache alone so a later run can retry
+            texts[idx] = ""
+            continue
+        texts[idx] = text
+        _ocr_cache_put(keys[idx], text)
+    for idx, first_idx in duplicate_of.items():
+        texts[idx] = texts[first_idx]
+    return texts
+
+def _ocr_images_uncached(image_bytes_list, use_google_vision=False):
+    # OCR is compute-bound, so fan the images out across processes;
+    # executor.map keeps results in input order. Entries are None where
+    # OCR failed, so callers can avoid caching failures.
+    if not image_bytes_list:
+        return []
+    if use_google_vision and GOOGLE_VISION_AVAILABLE:
+        if len(image_bytes_list) > _VISION_BATCH_LIMIT:
+            # several batches in flight at once: gather hides the RPC
+            # latency that sequential batch calls would serialize
+            try:
+                return _extract_text_google_vision_async(image_bytes_list)
+            except Exception:
+                pass
+        try:
+            return _extract_text_google_vision_batch(image_bytes_list)
+        except Exception:
+            return [_ocr_image_cached(b, use_google_vision=True)
+                    for b in image_bytes_list]
+    if TESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE and len(image_bytes_list) > 1:
+        # without the in-process API, batch images through single tesseract
+        # invocations to amortize engine init across each batch
+        chunks = [image_bytes_list[i:i + _TESS_BATCH_LIMIT]
+                  for i in range(0, len(image_bytes_list), _TESS_BATCH_LIMIT)]
+        try:
+            if len(chunks) == 1:
+                return _extract_text_tesseract_batch(chunks[0])
+            max_workers = min(os.cpu_count() or 1, 4)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_ocr_worker) as ex:
+                results = []
+                for chunk_texts in ex.map(_extract_text_tesseract_batch, chunks):
+                    results.extend(chunk_texts)
+                return results
+        except Exception:
+            pass  # fall through to the per-image path
+    if len(image_bytes_list) == 1:
+        return [_ocr_image_cached(image_bytes_list[0])]
+    max_workers = min(os.cpu_count() or 1, 4)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_ocr_worker) as ex:
+        return list(ex.map(_ocr_image_cached, image_bytes_list, chunksize=4))
+
+def extract_from_pdf(pdf_path, use_google_vision=False):
+    import fitz  # PyMuPDF (install via pip install PyMuPDF)
     doc = fitz.open(pdf_path)
-    all_text = ""
+    # accumulate page text in a list and join once at the end;
+    # repeated str += is quadratic in total document size
+    text_parts = []
     images = []
     links = []
-    for i, page in enumerate(doc):
-        all_text += page.get_text()
-        image_list = page.get_images(full=True)
-        for img_index, img in enumerate(image_list):
-            xref = img[0]
-            base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
-            image_ext = base_image["ext"]
-            image_name = f"{os.path.splitext(pdf_path)}_page{i+1}_img{img_index+1}.{image_ext}"
-            images.append((image_name, image_bytes))
+    # text extraction is the serial, GIL-holding section — keep it to
+    # one get_text call per page and defer image decoding until after
+    image_refs = []  # (page_num, img_index, xref)
+    text_flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+    for i, page in enumerate(doc.pages()):
+        # page markers let the chunker attribute chunks back to pages
+        text_parts.append(f"--- Page {i+1} ---\n")
+        text_parts.append(page.get_text("text", flags=text_flags))
         links.extend(page.get_links())
+        for img_index, img in enumerate(page.get_images(full=True)):
+            image_refs.append((i + 1, img_index + 1, img[0]))
+    all_text = "".join(text_parts)
+    ocr_results = _ocr_pdf_images(doc, pdf_path, image_refs, use_google_vision)
+    base_name = os.path.splitext(pdf_path)[0]
+    for (page_num, img_index, _), (image_ext, ocr_text) in zip(image_refs, ocr_results):
+        image_name = f"{base_name}_page{page_num}_img{img_index}.{image_ext}"
+        images.append((image_name, ocr_text))
     return all_text, images, links
 
-def extract_from_docx(docx_path):
+def extract_from_docx(docx_path, use_google_vision=False):
+    import docx  # python-docx (install via pip install python-docx)
     doc = docx.Document(docx_path)
-    all_text = " ".join([para.text for para in doc.paragraphs])
+    # newline-joined so the chunker can see paragraph boundaries
+    all_text = "\n".join([para.text for para in doc.paragraphs])
     images = []
     links = []
     for para in doc.paragraphs:
-        for run in para.runs:
-            if run.hyperlink:
-                links.append(run.hyperlink.target)
+        for hyperlink in para.hyperlinks:
+            if hyperlink.address:
+                links.append(hyperlink.address)
+    # OCR a window as soon as it fills so at most _OCR_WINDOW blob
+    # references are held here at a time
+    image_jobs = []
     for rel in doc.part.rels.values():
         if "image" in rel.target_ref:
-            images.append(rel.target_part.blob)
+            image_name = f"{os.path.splitext(docx_path)[0]}_{os.path.basename(rel.target_ref)}"
+            image_jobs.append((image_name, rel.target_part.blob))
+            if len(image_jobs) >= _OCR_WINDOW:
+                images.extend(_ocr_image_jobs(image_jobs, use_google_vision))
+                image_jobs = []
+    images.extend(_ocr_image_jobs(image_jobs, use_google_vision))
     return all_text, images, links
 
-def extract_from_pptx(pptx_path):
+def extract_from_pptx(pptx_path, use_google_vision=False):
+    from pptx import Presentation  # python-pptx (pip install python-pptx)
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
     prs = Presentation(pptx_path)
-    all_text = ""
+    text_parts = []
     images = []
     links = []
+    image_jobs = []
     for i, slide in enumerate(prs.slides):
+        text_parts.append(f"--- Slide {i+1} ---\n")
         for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                all_text += shape.text + "\n"
-            if "image" in shape.name.lower():
-                if hasattr(shape, "image") and shape.image:
-                    image_bytes = shape.image.blob
-                    image_ext = shape.image.ext
-                    images.append((f"{pptx_path}_slide{i+1}.{image_ext}", image_bytes))
-            if hasattr(shape, "hyperlink") and shape.hyperlink.address:
-                links.append(shape.hyperlink.address)
+            # dispatch on shape_type / has_text_frame instead of hasattr
+            # probing, which pays a probe-and-except cycle per shape
+            try:
+                shape_type = shape.shape_type
+            except NotImplementedError:
+                # unrecognized elements (e.g. p:contentPart)
+                shape_type = None
+            if shape_type == MSO_SHAPE_TYPE.PICTURE:
+                image = shape.image
+                image_jobs.append((f"{pptx_path}_slide{i+1}.{image.ext}", image.blob))
+                if len(image_jobs) >= _OCR_WINDOW:
+                    # flush mid-walk so blob references don't pile up
+                    images.extend(_ocr_image_jobs(image_jobs, use_google_vision))
+                    image_jobs = []
+            elif shape.has_text_frame:
+                text_parts.append(shape.text_frame.text + "\n")
+            if shape_type is not None and shape_type != MSO_SHAPE_TYPE.GROUP:
+                # group shapes raise TypeError on click_action
+                hyperlink = shape.click_action.hyperlink
+                if hyperlink.address:
+                    links.append(hyperlink.address)
+    all_text = "".join(text_parts)
+    images.extend(_ocr_image_jobs(image_jobs, use_google_vision))
     return all_text, images, links
 
 def extract_from_txt(txt_path):
-    with open(txt_path, "r", encoding="utf-8") as f:
-        text = f.read()
+    # memory-map the file and decode once: sniff the encoding from the
+    # first 64 KiB instead of re-reading the whole file on a decode
+    # failure, and never buffer the raw bytes through Python I/O
+    with open(txt_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return "", [], []
+        with mm:
+            encoding = "utf-8"
+            if CHARSET_NORMALIZER_AVAILABLE:
+                best = from_bytes(mm[:1 << 16]).best()
+                if best is not None and best.encoding:
+                    encoding = best.encoding
+            text = mm[:].decode(encoding, errors="replace")
     # TXT files have no images/links
     return text, [], []
 
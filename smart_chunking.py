@@ -0,0 +1,206 @@
+# chunk extracted documents into langchain Documents for the vector store
+# input: (text, images, links) from data_extraction.py
+# output: List[Document] with page/slide metadata preserved
+
+import re
+from collections import defaultdict
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# parse the page/slide markers emitted by data_extraction in a single
+# precompiled finditer pass; chained str.split calls would re-walk the
+# whole document once per marker piece
+_PAGE_RE = re.compile(r"--- Page (\d+) ---\n(.*?)(?=\n?--- Page \d+ ---|\Z)", re.DOTALL)
+_SLIDE_RE = re.compile(r"--- Slide (\d+) ---\n(.*?)(?=\n?--- Slide \d+ ---|\Z)", re.DOTALL)
+
+# image names carry their page/slide number (see data_extraction.py)
+_IMG_PAGE_RE = re.compile(r"_page(\d+)_")
+_IMG_SLIDE_RE = re.compile(r"_slide(\d+)\.")
+
+def _index_images(images, name_re):
+    # one linear pass building page -> images, instead of rescanning the
+    # whole image list for every chunk
+    index = defaultdict(list)
+    for img in images or []:
+        m = name_re.search(img[0])
+        if m:
+            index[int(m.group(1))].append(img)
+    return index
+
+# one combined bytes pattern so structure detection is a single C-level
+# scan over the document instead of a Python loop over every line:
+# group 1 = markdown header, 2 = numbered section, 3 = bullet item,
+# 4 = numbered list item (ordering makes sections win over list items)
+_STRUCT_SCAN = re.compile(
+    rb"(?m)^[ \t]*(?:"
+    rb"(#+[ \t].+)|"
+    rb"(\d+(?:\.\d+)*\.?[ \t]+[A-Z].+)|"
+    rb"([*\-+][ \t]+.+)|"
+    rb"(\d+\.?[ \t]+.+)"
+    rb")$")
+
+def _estimate_header_level(line):
+    if line.startswith("#"):
+        return len(line) - len(line.lstrip("#"))
+    # numbered sections like "2.3 Setup" nest one level per dotted part
+    first = line.split(None, 1)[0]
+    return first.rstrip(".").count(".") + 1
+
+def extract_headers_and_structure(text):
+    # standalone outline helper (not used by SmartDocumentChunker):
+    # collects headers and list items for callers that want a document's
+    # structure, e.g. for labeling or search filters; the regex scan and
+    # the newline prefix-sum both run at C level, so no per-line Python
+    # work remains
+    structure = {"headers": [], "lists": []}
+    headers = structure["headers"]
+    lists = structure["lists"]
+    data = text.encode("utf-8")
+    # byte offsets of newlines; searchsorted turns a match offset into
+    # its line number without a per-line counting loop
+    newline_offsets = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 0x0A)
+    for m in _STRUCT_SCAN.finditer(data):
+        line_num = int(np.searchsorted(newline_offsets, m.start()))
+        line = m.group(0).strip().decode("utf-8", "replace")
+        if m.group(1):
+            headers.append({
+                "line": line_num,
+                "text": line.lstrip("#").strip(),
+                "level": _estimate_header_level(line),
+            })
+        elif m.group(2):
+            headers.append({
+                "line": line_num,
+                "text": line,
+                "level": _estimate_header_level(line),
+            })
+        else:
+            lists.append({"line": line_num, "text": line})
+    return structure
+
+class SmartDocumentChunker:
+    def __init__(self, chunk_size=1000, chunk_overlap=200):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.default_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            add_start_index=True,
+        )
+
+    def chunk_document(self, text, doc_type, images=None, links=None, source=""):
+        if doc_type == "pdf":
+            return self._chunk_pdf(text, images, links, source)
+        elif doc_type == "pptx":
+            return self._chunk_pptx(text, images, links, source)
+        elif doc_type == "docx":
+            return self._chunk_docx(text, images, links, source)
+        return self._chunk_txt(text, source)
+
+    def _chunk_pdf(self, text, images, links, source):
+        chunks = []
+        matched = False
+        page_to_images = _index_images(images, _IMG_PAGE_RE)
+        # oversize pages are collected and handed to the splitter in one
+        # call instead of one splitter session per page
+        oversize_texts = []
+        oversize_metas = []
+        for m in _PAGE_RE.finditer(text):
+            matched = True
+            page_num = int(m.group(1))
+            body = m.group(2).strip()
+            if not body:
+                continue
+            page_images = page_to_images.get(page_num, [])
+            metadata = {
+                "source": source,
+                "doc_type": "pdf",
+                "page": page_num,
+                "images": [img[0] for img in page_images],
+            }
+            if len(body) <= self.chunk_size:
+                chunks.append(Document(page_content=body, metadata=metadata))
+            else:
+                oversize_texts.append(body)
+                oversize_metas.append(metadata)
+        if oversize_texts:
+            chunks.extend(self.default_splitter.create_documents(
+                oversize_texts, metadatas=oversize_metas))
+        if not matched:
+            return self._chunk_txt(text, source)
+        return chunks
+
+    def _chunk_pptx(self, text, images, links, source):
+        chunks = []
+        matched = False
+        slide_to_images = _index_images(images, _IMG_SLIDE_RE)
+        oversize_texts = []
+        oversize_metas = []
+        for m in _SLIDE_RE.finditer(text):
+            matched = True
+            slide_num = int(m.group(1))
+            body = m.group(2).strip()
+            if not body:
+                continue
+            slide_images = slide_to_images.get(slide_num, [])
+            metadata = {
+                "source": source,
+                "doc_type": "pptx",
+                "slide": slide_num,
+                "images": [img[0] for img in slide_images],
+            }
+            if len(body) <= self.chunk_size:
+                chunks.append(Document(page_content=body, metadata=metadata))
+            else:
+                oversize_texts.append(body)
+                oversize_metas.append(metadata)
+        if oversize_texts:
+            chunks.extend(self.default_splitter.create_documents(
+                oversize_texts, metadatas=oversize_metas))
+        if not matched:
+            return self._chunk_txt(text, source)
+        return chunks
+
+    def _chunk_docx(self, text, images, links, source):
+        # group paragraphs until the chunk budget is hit
+        chunks = []
+        metadata = {
+            "source": source,
+            "doc_type": "docx",
+            "images": [img[0] for img in (images or [])],
+        }
+        # buffer paragraphs in a list and join on flush; growing a str
+        # with += recopies the whole chunk for every paragraph
+        buf = []
+        buf_len = 0
+        chunk_size = self.chunk_size
+        # paragraphs that alone exceed the budget go to the splitter in
+        # one call, like oversize pages in _chunk_pdf
+        oversize_texts = []
+        for para in text.split("\n"):
+            if buf_len + len(para) + 1 > chunk_size and buf:
+                content = "\n".join(buf).strip()
+                if content:
+                    chunks.append(Document(page_content=content, metadata=dict(metadata)))
+                buf = []
+                buf_len = 0
+            if len(para) + 1 > chunk_size:
+                oversize_texts.append(para)
+                continue
+            buf.append(para)
+            buf_len += len(para) + 1
+        content = "\n".join(buf).strip()
+        if content:
+            chunks.append(Document(page_content=content, metadata=dict(metadata)))
+        if oversize_texts:
+            chunks.extend(self.default_splitter.create_documents(
+                oversize_texts,
+                metadatas=[dict(metadata) for _ in oversize_texts]))
+        return chunks
+
+    def _chunk_txt(self, text, source):
+        metadata = {"source": source, "doc_type": "txt"}
+        return [Document(page_content=piece, metadata=dict(metadata))
+                for piece in self.default_splitter.split_text(text)]